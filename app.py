@@ -1,7 +1,8 @@
+import os
+import shutil
 import requests
 import streamlit as st
 import polars as pl
-import pandas as pd
 import plotly.express as px
 from pathlib import Path
 
@@ -34,38 +35,81 @@ zone_url = "https://d37ci6vzurychx.cloudfront.net/misc/taxi_zone_lookup.csv"
 trip_file = raw_data_path / "yellow_tripdata_2024_01.parquet"
 zone_file = raw_data_path / "taxi_zone_lookup.csv"
 
+# Cleaned + feature engineered output is written here once so cold starts skip the ETL
+processed_data_path = Path("data/processed")
+processed_data_path.mkdir(parents=True, exist_ok=True)
+
+processed_file = processed_data_path / "yellow_2024_01.parquet"
+processed_zone_file = processed_data_path / "zones.parquet"
+
+# Bump this whenever the cleaning/feature steps change so old processed files get rebuilt
+ETL_VERSION = "8"
+
+# Width (in miles) of each bar in the trip distance histogram, 50 bars over the 0-100 mile range
+DISTANCE_BIN_WIDTH = 2
+
+# One session for all downloads so the connection (and TLS handshake) to the TLC server is reused
+SESSION = requests.Session()
+
 def download_file(url, destination):
     if not destination.exists():
-        response = requests.get(url, stream=True)
-        if response.status_code != 200:
-            raise Exception(f"Failed to download {url}")
-        with open(destination, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        with SESSION.get(url, stream=True, timeout=60) as response:
+            if response.status_code != 200:
+                raise Exception(f"Failed to download {url}")
+            response.raw.decode_content = True # undo any gzip transfer encoding while streaming
+            # written to a .tmp file and renamed once complete, so a dropped connection can't leave
+            # a truncated file behind that later runs would treat as already downloaded
+            tmp_destination = destination.with_suffix(".tmp")
+            with open(tmp_destination, "wb") as f:
+                # copy in 1 MiB blocks instead of 8 KiB chunks (far fewer Python loop iterations / writes)
+                shutil.copyfileobj(response.raw, f, length=1 << 20)
+            os.replace(tmp_destination, destination)
         print(f"Downloaded: {destination}")
     else:
         print(f"File already exists: {destination}")
 
 
-@st.cache_data
-def load_data():
+def build_processed_data():
     """
-    Loads and cleans the taxi dataset.
+    Loads and cleans the taxi dataset, then saves the result to data/processed.
     Uses Polars lazy mode so we don’t load millions of rows into memory at once.
-    The function is cached so Streamlit does not reload the dataset on every interaction.
+    Only runs when the processed files are missing or were made by an older pipeline.
     """
-     # Download data if missing
-    download_file(trip_url, trip_file)
+    # Selecting only the columns that are needed in the dashboard to keep memory low
+    # (the raw pickup timestamp is only used for sorting, the dashboard filters on pickup_date/pickup_hour)
+    cols = ["fare_cents", 
+            "total_cents", 
+            "PULocationID", 
+            "trip_distance", 
+            "trip_duration_minutes", 
+            "pickup_hour", 
+            "pickup_day_of_week", 
+            "payment_type",
+            "pickup_date"
+           ]
+
+    # Download the (small) zone lookup if missing
     download_file(zone_url, zone_file)
 
-    data_path = trip_file
+    # The trip file is scanned straight from the TLC server unless a local copy already exists
+    # (e.g. from the notebook). Polars reads the parquet footer over HTTP and then only requests
+    # the byte ranges for the columns below, so the full ~50MB file is never downloaded.
+    data_path = trip_file if trip_file.exists() else trip_url
     zone_path = zone_file
     #data_path = "data/raw/yellow_tripdata_2024_01.parquet"
     #zone_path = "data/raw/taxi_zone_lookup.csv"
 
     # I Used scan_parquet (Lazy Mode) to prevent memory crashes that occurred 
     # This keeps the millions of rows on disk until we filter them
-    lazy_df = pl.scan_parquet(data_path)
+    lazy_df = pl.scan_parquet(data_path).select([
+        "tpep_pickup_datetime",
+        "tpep_dropoff_datetime",
+        "PULocationID",
+        "trip_distance",
+        "fare_amount",
+        "total_amount",
+        "payment_type"
+    ])
 
     # Data Cleaning to remove rows with missing columns
     lazy_df = lazy_df.drop_nulls([
@@ -85,45 +129,164 @@ def load_data():
     )
 
     # Feature Engineering 
+    # (trip speed is part of the notebook's analysis but the dashboard never shows it, so it isn't computed here)
     lazy_df = lazy_df.with_columns([
-        
+
         # Trip duration in minutes
         ((pl.col("tpep_dropoff_datetime") - pl.col("tpep_pickup_datetime"))
          .dt.total_minutes()).alias("trip_duration_minutes"),
 
-        # Trip speed in miles per hour
-        (pl.col("trip_distance") /
-         ((pl.col("tpep_dropoff_datetime") - pl.col("tpep_pickup_datetime"))
-          .dt.total_minutes() / 60)).alias("trip_speed_mph"),
-
         # Extract hour of pickup
         pl.col("tpep_pickup_datetime").dt.hour().alias("pickup_hour"),
 
-        # Extract weekday name
-        pl.col("tpep_pickup_datetime").dt.strftime("%A").alias("pickup_day_of_week")
+        # Extract weekday as a number (1 = Monday ... 7 = Sunday), names are only added when plotting
+        pl.col("tpep_pickup_datetime").dt.weekday().cast(pl.Int8).alias("pickup_day_of_week"),
+
+        # Pickup date, stored once so the date filter is a plain date compare instead of converting every timestamp
+        pl.col("tpep_pickup_datetime").dt.date().alias("pickup_date")
         
     ])
 
-    # Selecting only the columns that are needed in the dashboard to keep memory low
-    cols = ["tpep_pickup_datetime", 
-            "fare_amount", 
-            "total_amount", 
-            "PULocationID", 
-            "trip_distance", 
-            "trip_duration_minutes", 
-            "pickup_hour", 
-            "pickup_day_of_week", 
-            "payment_type"
-           ]
-    
-    # Collect the processed data into memory after the filtering and selecting is done
-    df = lazy_df.select(cols).collect()
-    zones = pl.read_csv(zone_path) # zone lookup table is loaded
+    # Downcast to the smallest types that fit (IDs < 300, hours 0-23, miles don't need float64)
+    # so the cached frame and every filter/groupby afterwards moves less memory.
+    # Money is stored as whole cents in Int32, which is exact (no float rounding in the totals)
+    # and only divided by 100 when it is displayed
+    lazy_df = lazy_df.with_columns(
+        pl.col("PULocationID").cast(pl.UInt16),
+        pl.col("payment_type").cast(pl.Int8),
+        pl.col("pickup_hour").cast(pl.UInt8),
+        pl.col("trip_distance").cast(pl.Float32),
+        pl.col("trip_duration_minutes").cast(pl.Int32),
+        (pl.col("fare_amount") * 100).round().cast(pl.Int32).alias("fare_cents"),
+        (pl.col("total_amount") * 100).round().cast(pl.Int32).alias("total_cents")
+    )
+
+    # Both files are written to a .tmp file first and only renamed into place once complete,
+    # so a run that stops partway never leaves a truncated parquet file behind.
+    # The zones go first, so an existing trip file means both are complete
+    tmp_zone_file = processed_zone_file.with_suffix(".tmp")
+    pl.read_csv(zone_path).write_parquet(tmp_zone_file) # zone lookup table is saved alongside
+    os.replace(tmp_zone_file, processed_zone_file)
+
+    # Stream the processed data straight to disk (sink_parquet never holds the full frame in memory)
+    # Sorted by pickup time (and so by pickup_date) with small row groups (~64k rows, less than a day of trips each),
+    # so a date filter can skip whole row groups using the min/max stats in the parquet footer.
+    # The timestamp itself is dropped after sorting since nothing reads it
+    tmp_file = processed_file.with_suffix(".tmp")
+    lazy_df.sort("tpep_pickup_datetime").select(cols).sink_parquet(
+        tmp_file,
+        compression="zstd",
+        row_group_size=65_536,
+        statistics=True,
+        metadata={"etl_version": ETL_VERSION}
+    )
+    os.replace(tmp_file, processed_file)
+
+
+def processed_data_is_current():
+    """
+    True if the processed files exist and were made by the current ETL_VERSION.
+    A file that can't be read (e.g. corrupt) counts as stale, so it just gets rebuilt.
+    """
+    if not (processed_file.exists() and processed_zone_file.exists()):
+        return False
+    try:
+        return pl.read_parquet_metadata(processed_file).get("etl_version") == ETL_VERSION
+    except (pl.exceptions.PolarsError, OSError):
+        return False
+
+
+@st.cache_resource
+def load_data():
+    """
+    Returns a lazy scan of the processed trip data plus the zone lookup table.
+    The scan is only read once, by the cached build_cube and build_distance_bins summaries;
+    reruns filter those in-memory summaries and never collect from the scan itself.
+    """
+    # Reuse the processed files if the pipeline has already been run
+    if not processed_data_is_current():
+        build_processed_data()
+
+    lazy_df = pl.scan_parquet(processed_file)
+    zones = pl.read_parquet(processed_zone_file)
+
+    return lazy_df, zones
+
+
+@st.cache_resource
+def build_cube():
+    """
+    Pre-aggregates the trips into a small summary table (one row per date, hour, weekday,
+    payment type and pickup zone) holding trip counts and sums.
+    Every filter in the sidebar is one of these keys, so the metrics and charts can be
+    worked out from this table instead of re-aggregating millions of raw trips per rerun.
+    Cached as a resource: every session shares the same frame instead of getting its own
+    unpickled copy on each call (safe because Polars frames are never modified in place).
+    """
+    lazy_df, _ = load_data()
+
+    cube = (
+        lazy_df
+        .group_by([
+            "pickup_date",
+            "pickup_hour",
+            "pickup_day_of_week",
+            "payment_type",
+            "PULocationID"
+        ])
+        .agg(
+            pl.len().alias("n"),
+            # sums are widened to 64 bits so totals don't overflow/lose precision over millions of trips
+            pl.col("fare_cents").cast(pl.Int64).sum().alias("sum_fare_cents"),
+            pl.col("total_cents").cast(pl.Int64).sum().alias("sum_total_cents"),
+            pl.col("trip_distance").cast(pl.Float64).sum().alias("sum_dist"),
+            pl.col("trip_duration_minutes").cast(pl.Int64).sum().alias("sum_dur")
+        )
+        .collect()
+    )
+
+    return cube
+
+
+@st.cache_resource
+def build_distance_bins():
+    """
+    Trip counts per DISTANCE_BIN_WIDTH mile bucket, kept per date, hour and payment type
+    so the sidebar filters still apply to the distance histogram.
+    Shared across sessions like build_cube.
+    """
+    lazy_df, _ = load_data()
+
+    distance_bins = (
+        lazy_df
+        .group_by([
+            "pickup_date",
+            "pickup_hour",
+            "payment_type",
+            # fixed width buckets [0, 2), [2, 4) ... [98, 100], trips of exactly 100 miles go in the last one
+            (pl.col("trip_distance") / DISTANCE_BIN_WIDTH).floor().cast(pl.Int16)
+            .clip(upper_bound=100 // DISTANCE_BIN_WIDTH - 1).alias("distance_bin")
+        ])
+        .agg(pl.len().alias("n"))
+        .collect()
+    )
 
-    return df, zones
+    return distance_bins
 
-# Initialize data as Polars objects
-df, zones = load_data()
+
+@st.cache_resource
+def zones_lookup():
+    """
+    Zone lookup as a plain LocationID -> Zone name dict, so names can be attached after aggregating.
+    The zone table never changes, so it is built once and shared by every session (no copy per call).
+    """
+    _, zones = load_data()
+    return dict(zip(zones["LocationID"].to_list(), zones["Zone"].to_list()))
+
+
+# Load the pre-aggregated summaries (the raw trips stay lazy inside load_data, only these are in memory)
+trip_cube = build_cube()
+distance_bins = build_distance_bins()
 
 # -----------------------------------------------------------------------------------------------------------
 # Sidebar Filters
@@ -161,11 +324,27 @@ payment_map = { # mapping the vague payment codes to readable labels
     3: 'No Charge'
 }
 
-payment_ids = df["payment_type"].unique().to_list()
+@st.cache_data
+def get_payment_ids():
+    """The payment IDs in the data never change, so they are only looked up once instead of every rerun."""
+    return build_cube()["payment_type"].unique().sort().to_list()
 
-payment_options = sorted(
-    [payment_map.get(i, f"ID {i}") for i in payment_ids]
-)
+@st.cache_resource
+def payment_lookup():
+    """
+    ID -> label and label -> ID maps for the payment types in the data, built once and shared by every session.
+    The reverse map turns the selected labels back into IDs directly.
+    """
+    label_by_id = {i: payment_map.get(i, f"ID {i}") for i in get_payment_ids()}
+    return {
+        "label_by_id": label_by_id,
+        "id_by_label": {label: i for i, label in label_by_id.items()},
+        "options": sorted(label_by_id.values())
+    }
+
+payment_ids_by_label = payment_lookup()["id_by_label"]
+
+payment_options = payment_lookup()["options"]
 
 selected_payments = st.sidebar.multiselect(
     "Select Payment Type",
@@ -173,40 +352,162 @@ selected_payments = st.sidebar.multiselect(
     default=payment_options
 )
 
-selected_ids = [
-    k for k, v in payment_map.items() 
-    if v in selected_payments
-]
+selected_ids = [payment_ids_by_label[label] for label in selected_payments]
 
 # -----------------------------------------------------------------------------------------------------------
 # Apply Filters (The Memory Secret)
 # -----------------------------------------------------------------------------------------------------------
 
-# 1. Filter in Polars first (takes 0.1 seconds, so it's way faster)
-filtered_polars = df.filter(
-    (pl.col("tpep_pickup_datetime").dt.date() >= date_range[0]) &
-    (pl.col("tpep_pickup_datetime").dt.date() <= date_range[1]) &
-    (pl.col("pickup_hour") >= hour_range[0]) &
-    (pl.col("pickup_hour") <= hour_range[1]) &
-    (pl.col("payment_type").is_in(selected_ids)) &
-    (pl.col("trip_distance") > 0) & (pl.col("trip_distance") <= 100)    
-)
+# 1. Filter the pre-aggregated summaries in Polars (a few hundred thousand rows instead of millions of trips)
+def sidebar_filter(date_range, hour_range, selected_ids):
+    """Polars filter for the sidebar selection, works on both the trip cube and the distance bins."""
+    # Trip distance is already limited to (0, 100] miles when the processed data is built
+    return (
+        (pl.col("pickup_date").is_between(date_range[0], date_range[1])) &
+        (pl.col("pickup_hour") >= hour_range[0]) &
+        (pl.col("pickup_hour") <= hour_range[1]) &
+        (pl.col("payment_type").is_in(selected_ids))
+    )
+
+# 2. Each metric/chart is cached on the filter values (tuples so Streamlit can hash them, capped at the
+# 256 most recent selections), and the summary table is passed as `_cube` so Streamlit doesn't hash it
+filter_key = (tuple(date_range), tuple(hour_range), tuple(sorted(selected_ids)))
+
+@st.cache_data(max_entries=256)
+def get_totals(_cube, date_range, hour_range, selected_ids):
+    """
+    Trip count and sums behind the key metrics, or None if no trips match the filters.
+    Like the other get_* functions this runs lazily, so Polars only reads the columns it uses.
+    """
+    totals = (
+        _cube
+        .lazy()
+        .filter(sidebar_filter(date_range, hour_range, selected_ids))
+        .select(pl.sum("n", "sum_fare_cents", "sum_total_cents", "sum_dist", "sum_dur"))
+        .collect()
+        .row(0, named=True)
+    )
+    if totals["n"] == 0:
+        return None
+    return totals
+
+@st.cache_data(max_entries=256)
+def get_top_zones(_cube, date_range, hour_range, selected_ids):
+    """Top 10 pickup zones by trip count."""
+    # Count trips per zone ID first, then look up the names for only the top 10 rows
+    # (instead of joining the zone table onto the whole filtered data)
+    zone_names = zones_lookup()
+
+    return (
+        _cube
+        .lazy()
+        .filter(sidebar_filter(date_range, hour_range, selected_ids))
+        .group_by("PULocationID")
+        .agg(pl.sum("n").alias("trip_count"))
+        .filter(pl.col("PULocationID").is_in(list(zone_names))) # same as the old inner join: skip IDs with no zone
+        .sort("trip_count", descending=True)
+        .head(10)
+        .with_columns(
+            pl.col("PULocationID").replace_strict(zone_names, return_dtype=pl.String).alias("Zone")
+        )
+        .collect()
+    )
+
+@st.cache_data(max_entries=256)
+def get_avg_fare_hour(_cube, date_range, hour_range, selected_ids):
+    """Average fare for each pickup hour."""
+    return (
+        _cube
+        .lazy()
+        .filter(sidebar_filter(date_range, hour_range, selected_ids))
+        .group_by("pickup_hour")
+        .agg((pl.sum("sum_fare_cents") / pl.sum("n") / 100).alias("fare_amount"))
+        .sort("pickup_hour")
+        .collect()
+    )
+
+@st.cache_data(max_entries=256)
+def get_payment_breakdown(_cube, date_range, hour_range, selected_ids):
+    """Share of trips for each payment type."""
+    return (
+        _cube
+        .lazy()
+        .filter(sidebar_filter(date_range, hour_range, selected_ids))
+        .group_by("payment_type")
+        .agg(pl.sum("n"))
+        .sort("n", descending=True) # fixed slice order (largest first) so colours don't move between reruns
+        .with_columns(
+            (pl.col("n") / pl.col("n").sum()).alias("proportion"),
+            pl.col("payment_type")
+            .replace_strict(payment_lookup()["label_by_id"], return_dtype=pl.String)
+            .alias("payment_type_labelled")
+        )
+        .collect()
+    )
 
-# 2. Converting only the smaller filtered data to Pandas for plotting
-filtered_df = filtered_polars.to_pandas()
+@st.cache_data(max_entries=256)
+def get_heatmap_data(_cube, date_range, hour_range, selected_ids):
+    """Trip counts as a weekday x hour grid: a day name column plus one column per hour."""
+    # Weekdays are stored as numbers (1 = Monday), so sorting by them already gives the right order
+    day_names = {1: "Monday", 2: "Tuesday", 3: "Wednesday", 4: "Thursday", 5: "Friday", 6: "Saturday", 7: "Sunday"}
+
+    trip_counts = (
+        _cube
+        .lazy()
+        .filter(sidebar_filter(date_range, hour_range, selected_ids))
+        .group_by(["pickup_day_of_week", "pickup_hour"])
+        .agg(pl.sum("n").alias("trip_count"))
+        .sort("pickup_hour")
+        .collect()
+        .pivot(on="pickup_hour",
+             index="pickup_day_of_week",
+             values="trip_count")
+    )
+
+    return (
+        pl.DataFrame({"pickup_day_of_week": list(day_names)}, schema={"pickup_day_of_week": pl.Int8})
+        .join(trip_counts, on="pickup_day_of_week", how="left") # This ensures Monday is at the top, Sunday at the bottom
+        .fill_null(0)
+        .with_columns(pl.col("pickup_day_of_week").replace_strict(day_names)) # names are only attached to the 7 aggregated rows
+    )
+
+@st.cache_data(max_entries=256)
+def get_distance_hist(_bins, date_range, hour_range, selected_ids):
+    """Trip counts per distance bucket, so only ~50 rows reach Plotly instead of every trip."""
+    return (
+        _bins
+        .lazy()
+        .filter(sidebar_filter(date_range, hour_range, selected_ids))
+        .group_by("distance_bin")
+        .agg(pl.sum("n").alias("count"))
+        .sort("distance_bin")
+        .with_columns(
+            # bar sits at the bucket centre, the hover shows the full range of the bucket
+            ((pl.col("distance_bin") + 0.5) * DISTANCE_BIN_WIDTH).alias("trip_distance"),
+            pl.format("{}-{} mi",
+                      pl.col("distance_bin") * DISTANCE_BIN_WIDTH,
+                      (pl.col("distance_bin") + 1) * DISTANCE_BIN_WIDTH).alias("distance_range")
+        )
+        .collect()
+    )
 
 # -----------------------------------------------------------------------------------------------------------
 # Key Metrics
 # -----------------------------------------------------------------------------------------------------------
 
-if not filtered_df.empty:
+totals = get_totals(trip_cube, *filter_key)
+
+if totals is not None:
     col1, col2, col3, col4, col5 = st.columns(5)
 
-    col1.metric("Total Trips", f"{len(filtered_df):,}")
-    col2.metric("Average Fare ($)", f"{filtered_df['fare_amount'].mean():.2f}")
-    col3.metric("Total Revenue ($)", f"{filtered_df['total_amount'].sum():,.0f}")
-    col4.metric("Avg Distance (mi)", f"{filtered_df['trip_distance'].mean():.2f}")
-    col5.metric("Avg Duration (min)", f"{filtered_df['trip_duration_minutes'].mean():.2f}")
+    # each row of the summary holds a count and sums, so averages are sum / count
+    total_trips = totals["n"]
+
+    col1.metric("Total Trips", f"{total_trips:,}")
+    col2.metric("Average Fare ($)", f"{totals['sum_fare_cents'] / total_trips / 100:.2f}")
+    col3.metric("Total Revenue ($)", f"{totals['sum_total_cents'] / 100:,.0f}")
+    col4.metric("Avg Distance (mi)", f"{totals['sum_dist'] / total_trips:.2f}")
+    col5.metric("Avg Duration (min)", f"{totals['sum_dur'] / total_trips:.2f}")
 
     st.markdown("---")
 
@@ -248,15 +549,7 @@ tab1, tab2, tab3 = st.tabs(["Demand Patterns", "Fare & Payments", "Temporal Tren
 # -----------------------------------------------------------------------------------------------------------
 
 with tab1:
-    top_zones = (
-        filtered_df
-        .merge(zones.to_pandas(), left_on="PULocationID", right_on="LocationID")
-        .groupby("Zone")
-        .size()
-        .reset_index(name="trip_count")
-        .sort_values("trip_count", ascending=False)
-        .head(10)
-    )
+    top_zones = get_top_zones(trip_cube, *filter_key)
 
     fig1 = px.bar(
        top_zones,
@@ -296,12 +589,7 @@ The presence of Penn Station/Madison Square West and Times Square/Theatre Distri
 # -----------------------------------------------------------------------------------------------------------
 
 with tab2:
-    avg_fare_hour = (
-        filtered_df
-        .groupby("pickup_hour")["fare_amount"]
-        .mean()
-        .reset_index()
-    )
+    avg_fare_hour = get_avg_fare_hour(trip_cube, *filter_key)
 
     fig2 = px.line(
         avg_fare_hour,
@@ -337,16 +625,7 @@ Interestingly, there is a noticeable dip around 6:00 PM, where the fare drops to
     """)
 
 
-    payment_breakdown = (
-        filtered_df["payment_type"]
-        .value_counts(normalize=True)
-        .reset_index()
-    )
-
-    payment_breakdown.columns = ['payment_type', 'proportion']
-        
-    payment_map = {1: 'Credit Card', 2: 'Cash', 0: 'Void/Unknown', 4: 'Dispute', 3: 'No Charge'}
-    payment_breakdown['payment_type_labelled'] = payment_breakdown['payment_type'].map(payment_map)
+    payment_breakdown = get_payment_breakdown(trip_cube, *filter_key)
         
     fig3 = px.pie(
         payment_breakdown,
@@ -388,23 +667,13 @@ Tips are automatically recorded for credit card payments but are generally not i
 # -----------------------------------------------------------------------------------------------------------
 
 with tab3:
-    # Define day order to prevent alphabetical sorting (Friday, Monday...)
-    day_order = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        
-    heatmap_data = (
-        filtered_df
-        .groupby(["pickup_day_of_week", "pickup_hour"])
-        .size()
-        .reset_index(name="trip_count")
-        .pivot(index="pickup_day_of_week",
-             columns="pickup_hour",
-             values="trip_count")
-        .reindex(day_order) # This ensures Monday is at the top, Sunday at the bottom
-        .fillna(0)
-    )
+    heatmap_data = get_heatmap_data(trip_cube, *filter_key)
 
     fig4 = px.imshow(
-        heatmap_data,
+        heatmap_data.drop("pickup_day_of_week").to_numpy(),
+        x=[int(hour) for hour in heatmap_data.columns[1:]], # pivot gives the hours as string column names
+        y=heatmap_data["pickup_day_of_week"].to_list(),
+        labels={"x": "pickup_hour", "y": "pickup_day_of_week"},
         aspect="auto",
         title="Trips by Day and Hour",
         template="plotly_white"
@@ -435,13 +704,18 @@ On Friday, demand starts to ramp up earlier in the afternoon (around 2:00 PM / 1
 Sunday has a very different "signature" than the rest of the week. It has the lowest peak volume overall (fewer bright orange/yellow areas). Activity is more evenly spread throughout the afternoon rather than having a sharp evening spike. Sunday demand is likely driven by leisure and personal errands rather than the rigid schedules of the 9-to-5 work week.
     """)
 
-    fig5 = px.histogram(
-        filtered_df,
+    distance_hist = get_distance_hist(distance_bins, *filter_key)
+
+    fig5 = px.bar(
+        distance_hist,
         x="trip_distance",
-        nbins=50,
+        y="count",
+        hover_data={"trip_distance": False, "distance_range": True},
+        labels={"trip_distance": "trip_distance (miles)", "distance_range": "distance"},
         title="Trip Distance Distribution",
         template="plotly_white"
     )
+    fig5.update_layout(bargap=0)
     st.plotly_chart(fig5, use_container_width=True)
     st.markdown("""
 ### The "Under 5-Mile" Dominance  